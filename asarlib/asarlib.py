@@ -7,7 +7,26 @@
 import os
 import sys
 import json
+import mmap
 import struct
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import simdjson
+except ImportError:  # pragma: no cover
+    simdjson = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
 
 if sys.platform == "win32":
     ENCODING = "ANSI"
@@ -16,6 +35,115 @@ elif sys.platform == "darwin":
 else:
     ENCODING = "utf-8"
 
+# Extensions of files which are never decoded by ``AsarFile.read_file``
+BINARY_EXTENSIONS = frozenset(
+    """
+    .bin .bmp .dat .dll .dylib .eot .exe .gif .gz .icns .ico .jpeg .jpg .mp3 .mp4
+    .node .ogg .otf .pak .pdf .png .so .ttf .wasm .wav .webm .webp .woff .woff2 .zip
+    """.split()
+)
+
+# Maximum header size parsed with the shared per-thread simdjson parser
+PARSER_CAPACITY = 64 * 1024 * 1024
+
+# Two little-endian 32-bit unsigned integers, used for the size fields of the header
+_PREAMBLE = struct.Struct("<II")
+
+# Files up to this size are written with a single unbuffered ``os.write``
+RAW_WRITE_SIZE = 1024 * 1024
+# Buffer size used for writing larger files
+WRITE_BUFFER_SIZE = 1024 * 1024
+# Files larger than this are copied in chunks of this size instead of at once
+COPY_CHUNK_SIZE = 4 * 1024 * 1024
+# ``os.sendfile`` only accepts regular files as target on Linux, other platforms
+# require a socket
+_USE_SENDFILE = sys.platform.startswith("linux") and hasattr(os, "sendfile")
+# Flags for opening extracted files via ``os.open`` (binary mode on Windows)
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+# Maximum number of bytes read at once when extracting multiple files
+BULK_READ_SIZE = 64 * 1024 * 1024
+# Number of threads writing the extracted files
+EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+# Maximum number of files and bytes written by a single task of a thread
+EXTRACT_BATCH_FILES = 64
+EXTRACT_BATCH_SIZE = 4 * 1024 * 1024
+# Files larger than this are prefetched by the kernel before they are extracted
+PREFETCH_SIZE = 1024 * 1024
+# Access pattern hints for the memory map (not available on all platforms)
+_MADV_NORMAL = getattr(mmap, "MADV_NORMAL", None)
+_MADV_SEQUENTIAL = getattr(mmap, "MADV_SEQUENTIAL", None)
+_MADV_WILLNEED = getattr(mmap, "MADV_WILLNEED", None)
+
+
+_thread_local = threading.local()
+
+
+def _get_parser():
+    """Returns the simdjson parser of the current thread, creating it if needed."""
+    parser = getattr(_thread_local, "parser", None)
+    if parser is None:
+        parser = simdjson.Parser(max_capacity=PARSER_CAPACITY)
+        _thread_local.parser = parser
+    return parser
+
+
+def _get_copy_buffer():
+    """Returns the buffer of the current thread used for copying file contents."""
+    buf = getattr(_thread_local, "copy_buffer", None)
+    if buf is None:
+        buf = memoryview(bytearray(COPY_CHUNK_SIZE))
+        _thread_local.copy_buffer = buf
+    return buf
+
+
+def _index_header(header_data):
+    """Builds the file index of a header from the events of a streaming parser.
+
+    Returns the ``(offset, size)`` of all files, indexed by their path, the set of
+    paths of executable files and the missing field of all files which are not
+    stored in the archive (e.g. unpacked files or links), without building the
+    nested header.
+    """
+    index, executables, missing = dict(), set(), dict()
+    # Each open JSON object is tracked as ``[kind, path, key, offset, size, exe,
+    # is_dir]``. The kind is 'entry' for file and directory entries and 'files' for
+    # the contents of a directory, other objects (e.g. 'integrity') are ignored.
+    stack, top = list(), None
+    for event, value in ijson.basic_parse(header_data):
+        if event == "map_key":
+            top[2] = value
+        elif event == "start_map":
+            if top is None:
+                kind, path = "entry", ""
+            elif top[0] == "entry" and top[2] == "files":
+                kind, path = "files", top[1]
+                top[6] = True
+            elif top[0] == "files":
+                kind, path = "entry", f"{top[1]}/{top[2]}" if top[1] else top[2]
+            else:
+                kind, path = None, None
+            top = [kind, path, None, None, None, False, False]
+            stack.append(top)
+        elif event == "end_map":
+            kind, path, _, offset, size, exe, is_dir = stack.pop()
+            # Like in the full header, only files stored in the archive are indexed
+            if kind == "entry" and offset is not None and size is not None:
+                index[path] = int(offset), int(size)
+                if exe:
+                    executables.add(path)
+            elif kind == "entry" and path and not is_dir:
+                missing[path] = "offset" if offset is None else "size"
+            top = stack[-1] if stack else None
+        elif top is not None and top[0] == "entry":
+            if top[2] == "offset":
+                top[3] = value
+            elif top[2] == "size":
+                top[4] = value
+            elif top[2] == "executable":
+                top[5] = bool(value)
+    return index, executables, missing
+
 
 class AsarFileHeaderError(KeyError):
     pass
@@ -33,6 +161,8 @@ class AsarFile:
         The mode for opening the Asar file. The default is 'r' (read).
     encoding : str, optional
         The encoding of the Asar archive. The default is platform specific.
+    index_only : bool, optional
+        If True, only the file index is built when opening the archive. See ``open``.
 
     Attributes
     ----------
@@ -74,21 +204,70 @@ class AsarFile:
     ...     asar.extract(dst=dst_dir)
     """
 
-    def __init__(self, file=None, mode="r", encoding=None):
+    def __init__(self, file=None, mode="r", encoding=None, index_only=False):
         self._encoding = encoding or ENCODING
         self._content_offset = 0
         self._fh = None
+        self._mm = None
+        # Position of the file pointer, used to skip redundant seeks
+        self._pos = 0
+        # The parsed header. This is either a ``dict`` or, if ``simdjson`` is
+        # available, a lazy document which is only materialized on demand. If only
+        # the file index was built, the header is None. The unparsed JSON data is kept
+        # until the header is needed as ``dict``.
+        self._root = dict()
+        self._header_data = None
+        # Resolved header sections, indexed by their path in the archive
+        self._header_cache = dict()
+        # Flat index mapping the paths of all files to their ``(offset, size)``
+        self._file_index = dict()
+        # Paths of all executable files
+        self._executables = set()
+        # Missing fields of the files which are not in the index, only known if
+        # the index was built without parsing the header
+        self._missing_fields = dict()
+        # Paths of the directories as yielded by ``walk``, indexed by the id of
+        # their 'files' dictionary
+        self._dir_paths = dict()
 
-        self.headers = dict()
         if file is not None:
-            self.open(file, mode)
+            self.open(file, mode, index_only)
 
     @property
     def encoding(self):
         """str: The encoding of the Asar file."""
         return self._encoding
 
-    def open(self, file, mode="r"):
+    @property
+    def headers(self):
+        """dict: The header data of the Asar archive as dictionary."""
+        if not isinstance(self._root, dict):
+            # Converting the whole lazy document is slower than parsing the header
+            # again, so the lazy document is only used for looking up single items.
+            root = None
+            if orjson is not None:
+                try:
+                    root = orjson.loads(self._header_data)
+                except orjson.JSONDecodeError:
+                    pass
+            if root is None:
+                root = self._get_root()
+                if not isinstance(root, dict):
+                    root = root.as_dict()
+            self._root = root
+            self._header_data = None
+            self._header_cache.clear()
+            self._build_index()
+        return self._root
+
+    def _get_root(self):
+        if self._root is None:
+            self._root = self._parse_header(self._header_data)
+            if isinstance(self._root, dict):
+                self._header_data = None
+        return self._root
+
+    def open(self, file, mode="r", index_only=False):
         """Open an Asar file.
 
         Parameters
@@ -97,11 +276,20 @@ class AsarFile:
             The file path of the Asar file to open.
         mode : {'r', 'w'} str, optional
             The mode for opening the Asar file. The default is 'r' (read).
+        index_only : bool, optional
+            If True and ``ijson`` is installed, only the offsets and sizes of the
+            files are read from the header by a streaming parser, without building
+            the nested header. This reduces the memory usage for archives which are
+            only read or extracted. The full header is parsed once it is needed,
+            e.g. by ``get_header``, ``walk`` or ``treestr``. Ignored if ``simdjson``
+            is installed, since its lazily parsed header is faster and smaller.
         """
         # Open the file handler
         mode = mode.rstrip("b")
         if mode == "w":
             raise NotImplementedError("Writing Asar headers is not yet supported!")
+        # Release a previously opened archive and the headers cached for it
+        self.close()
         self._fh = open(file, f"{mode}b")
 
         # Parse the Asar file tags:
@@ -110,8 +298,9 @@ class AsarFile:
         # _encoding the length of the ``len_header`` field (always 4).
         # The following 4 bytes is the 32-bit unsigned int ``len_header``, which
         # specifies the number of bytes in the Asar header.
-        len_size, len_header = struct.unpack("II", self._fh.read(8))
-        assert len_size == 4
+        len_size, len_header = _PREAMBLE.unpack(self._fh.read(_PREAMBLE.size))
+        if len_size != 4:
+            raise ValueError(f"Invalid Asar file: size field has length {len_size}")
 
         # The pickle format uses 8 bytes padding for each field, so the header start.
         # With the first 4 bytes the header starts at:
@@ -120,23 +309,106 @@ class AsarFile:
 
         # Read the actual Asar header.
         # The header is a JSON string storing the information about the contents in the
-        # ASAR file.
-        self._fh.seek(header_start)
-        header_data: bytes = self._fh.read(len_header)  # noqa
-        if header_data.endswith(b"\x00"):
-            header_data = header_data.rstrip(b"\x00")
-        self.headers = json.loads(header_data.decode(self._encoding))
+        # ASAR file. The file pointer is already positioned after the first 8 bytes,
+        # so the remaining padding and the header are read at once without seeking.
+        # The skipped padding holds the size of the header pickle payload and the
+        # exact length of the JSON string, which is used to cut off the trailing
+        # padding with a view instead of copying the header.
+        skip = header_start - _PREAMBLE.size
+        data = memoryview(self._fh.read(skip + len_header))
+        if len(data) < skip:
+            raise ValueError("Invalid Asar file: header is truncated")
+        _, len_json = _PREAMBLE.unpack_from(data)
+        if len_json > len(data) - skip:
+            raise ValueError("Invalid Asar file: header is truncated")
+        header_data = data[skip : skip + len_json]
+        if index_only and ijson is not None and simdjson is None:
+            try:
+                index = _index_header(bytes(header_data))
+            except (ijson.JSONError, ValueError):
+                index = None
+        else:
+            index = None
+        if index is not None:
+            self._file_index, self._executables, self._missing_fields = index
+            self._root = None
+            self._header_data = header_data
+        else:
+            self._root = self._parse_header(header_data)
+            if isinstance(self._root, dict):
+                self._build_index()
+            else:
+                # Lazily parsed headers fill the index on demand instead
+                self._header_data = header_data
 
         # Store start of content (after header)
         self._content_offset = header_start + len_header
+        self._pos = self._fh.tell()
+
+        # Memory-map the archive for random access reads of the contained files.
+        # If the file can't be mapped, all reads go through the file handle.
+        try:
+            self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._mm = None
+
+    def _parse_header(self, header_data):
+        # simdjson parses the header lazily: Sub-trees are only converted to Python
+        # objects once they are accessed, so looking up a single file does not
+        # require building the full header dictionary.
+        #
+        # The parser is reused across archives to avoid reallocating its internal
+        # buffers. Headers exceeding its capacity get a separate parser, as does
+        # a header parsed while the document of another open archive still
+        # references the shared parser.
+        if simdjson is not None:
+            try:
+                if len(header_data) <= PARSER_CAPACITY:
+                    try:
+                        return _get_parser().parse(header_data)
+                    except RuntimeError:
+                        pass
+                return simdjson.Parser().parse(header_data)
+            except ValueError:
+                pass
+        # orjson parses the raw bytes directly, which avoids decoding the whole
+        # header to a string first. Headers which are not valid UTF-8 (legacy
+        # archives using a different encoding) fall back to the stdlib parser.
+        if orjson is not None:
+            try:
+                return orjson.loads(header_data)
+            except orjson.JSONDecodeError:
+                pass
+        # Headers written by the reference packer are ASCII, which decodes faster
+        # than the configured encoding.
+        try:
+            text = str(header_data, "ascii")
+        except UnicodeDecodeError:
+            text = str(header_data, self._encoding)
+        return json.loads(text)
 
     def close(self):
         """Closes the Asar file if it is still open."""
+        if self._mm is not None:
+            try:
+                self._mm.close()
+            except BufferError:
+                # Memoryviews returned by ``read_file`` are still referenced, the
+                # map is released once they are garbage collected.
+                pass
+            self._mm = None
         if self._fh is not None:
             self._fh.close()
             self._fh = None
             self._content_offset = 0
-            self.headers.clear()
+            self._pos = 0
+            self._root = dict()
+            self._header_data = None
+            self._header_cache.clear()
+            self._file_index.clear()
+            self._executables.clear()
+            self._dir_paths.clear()
+            self._missing_fields.clear()
 
     def __enter__(self):
         return self
@@ -158,7 +430,11 @@ class AsarFile:
             position in the content section (after the header) in the Asar file.
             Passing ``pos=0`` sets the file pointer to the start of the content section.
         """
-        self._fh.seek(self._content_offset + int(pos))
+        pos = self._content_offset + int(pos)
+        if pos != self._pos:
+            if self._mm is None:
+                self._fh.seek(pos)
+            self._pos = pos
 
     def tell(self):
         """Returns the file pointer position in the Asar file content, after the header.
@@ -170,7 +446,7 @@ class AsarFile:
             position in the Asar file, but the position in the content section
             (after the header) in the Asar file.
         """
-        return self._fh.tell() - self._content_offset
+        return self._pos - self._content_offset
 
     def read(self, n=None, decode=True, encoding=None):
         """Reads data from the Asar file content, starting after the header.
@@ -192,11 +468,33 @@ class AsarFile:
             The data read from the Asar file content. Either a string if ``decode=True``
             or the raw bytes.
         """
-        data = self._fh.read(n)
+        if self._mm is None:
+            data = self._fh.read(n)
+        else:
+            end = len(self._mm) if n is None or n < 0 else self._pos + n
+            data = self._mm[self._pos : end]
+        self._pos += len(data)
         if decode:
             data = data.decode(encoding or self.encoding)
         return data
 
+    @staticmethod
+    def _field(item, key):
+        # simdjson raises a ``KeyError`` without the missing key, which is re-raised
+        # with the key like for header dictionaries.
+        try:
+            return item[key]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def _lookup(self, path):
+        # Returns the header item of a path without converting lazy documents
+        keys = [key for key in path.replace("\\", "/").split("/") if key]
+        item = self._get_root()
+        for key in keys:
+            item = self._field(self._field(item, "files"), key)
+        return item
+
     def get_header(self, path="", keep_files=False):
         """Returns the data of a header section in the Asar archive.
 
@@ -221,18 +519,15 @@ class AsarFile:
         {'offset': 12345, 'size': 100}
 
         """
-        if not path:
-            return self.headers if keep_files else self.headers["files"]
-        root, name = os.path.split(path)
-        keys = [name]
-        while root:
-            root, name = os.path.split(root)
-            keys.append(name)
-        keys = keys[::-1]
-        parent = self.headers["files"]
-        for key in keys[:-1]:
-            parent = parent[key]["files"]
-        item = parent[keys[-1]]
+        try:
+            item = self._header_cache[path]
+        except KeyError:
+            item = self._lookup(path)
+            if item is self._root:
+                return self.headers if keep_files else self.headers["files"]
+            if not isinstance(item, dict):
+                item = item.as_dict()
+            self._header_cache[path] = item
         if keep_files:
             return item
         return item.get("files", item)
@@ -264,20 +559,28 @@ class AsarFile:
         ...         for name in filenames:
         ...             file_path = os.path.join(root, name)
         """
+        path_join = os.path.join
         root_item = self.get_header(root_path)
-        parents = [(root_path, root_item)]
-        while parents:
-            new_parents = list()
-            for root, parent in parents:
-                dirs, files = list(), list()
-                for name, content in parent.items():
-                    if "files" in content:
-                        dirs.append(name)
-                        new_parents.append((os.path.join(root, name), content["files"]))
-                    else:
-                        files.append(name)
-                yield root, dirs, files
-            parents = new_parents
+        # The cached directory paths are only valid if ``root_path`` has the same form
+        dir_paths = self._dir_paths
+        if dir_paths.get(id(root_item)) != root_path:
+            dir_paths = dict()
+        # Depth-first traversal, the directories are yielded top-down like ``os.walk``
+        stack = [(root_path, root_item)]
+        while stack:
+            root, parent = stack.pop()
+            dirs, files, subdirs = list(), list(), list()
+            for name, content in parent.items():
+                sub = content.get("files")
+                if sub is None:
+                    files.append(name)
+                else:
+                    dirs.append(name)
+                    path = dir_paths.get(id(sub)) or path_join(root, name)
+                    subdirs.append((path, sub))
+            yield root, dirs, files
+            # Subdirectories are pushed in reverse to pop them in the original order
+            stack.extend(reversed(subdirs))
 
     def walk_files(self, root_path=""):
         """enerates the file names in a directory in the Asar archive.
@@ -328,7 +631,58 @@ class AsarFile:
         parent = self.get_header(root)
         return list(parent.keys())
 
-    def read_file(self, path, decode=True, encoding=None):
+    def _build_index(self):
+        index, dir_paths = self._file_index, self._dir_paths
+        executables = self._executables
+        path_join = os.path.join
+        root_files = self._root["files"]
+        dir_paths[id(root_files)] = ""
+        stack = [("", "", root_files)]
+        while stack:
+            prefix, dir_path, files = stack.pop()
+            for name, item in files.items():
+                if "files" in item:
+                    sub_path = path_join(dir_path, name)
+                    dir_paths[id(item["files"])] = sub_path
+                    stack.append((f"{prefix}{name}/", sub_path, item["files"]))
+                elif "offset" in item and "size" in item:
+                    index[prefix + name] = int(item["offset"]), int(item["size"])
+                    if item.get("executable", False):
+                        executables.add(prefix + name)
+
+    @staticmethod
+    def _index_key(path):
+        return path.replace("\\", "/").strip("/")
+
+    def _file_range(self, path):
+        # Paths are usually given in the normalized form of the index keys already
+        entry = self._file_index.get(path)
+        if entry is not None:
+            return entry
+        key = self._index_key(path)
+        try:
+            return self._file_index[key]
+        except KeyError:
+            pass
+        header = self._lookup(path)
+        try:
+            offset, size = self._field(header, "offset"), self._field(header, "size")
+        except KeyError as e:
+            raise AsarFileHeaderError(f"Could not read file '{path}': {e}")
+        entry = int(offset), int(size)
+        self._file_index[key] = entry
+        if header.get("executable", False):
+            self._executables.add(key)
+        return entry
+
+    def _is_binary(self, path):
+        # The executable flags are recorded with the file index, so the range of
+        # the file has to be looked up first.
+        if os.path.splitext(path)[1].lower() in BINARY_EXTENSIONS:
+            return True
+        return self._index_key(path) in self._executables
+
+    def read_file(self, path, decode=True, encoding=None, as_memoryview=False):
         """Reads the data of a file contained in the Asar archive.
 
         Parameters
@@ -336,14 +690,20 @@ class AsarFile:
         path : str
             The path of the file in the archive to read.
         decode : bool, optional
-            If True, the bytes read from the file are decoded.
+            If True, the bytes read from the file are decoded. Binary files, i.e.
+            executables and files with an extension in ``BINARY_EXTENSIONS``, are
+            never decoded.
         encoding : str, optional
             Encoding used if ``decode=True``. If not passed the instance encoding is
             used.
+        as_memoryview : bool, optional
+            If True, a ``memoryview`` of the raw bytes is returned and ``decode`` is
+            ignored. If the archive is memory-mapped, the view references the mapped
+            file directly and no copy of the data is made.
 
         Returns
         -------
-        data : str or bytes
+        data : str or bytes or memoryview
             The data read from the Asar file content. Either a string if ``decode=True``
             or the raw bytes.
 
@@ -352,14 +712,41 @@ class AsarFile:
         >>> with AsarFile("file.asar") as asar
         ...     data = asar.read_file("folder/file.txt")
         """
-        header = self.get_header(path)
-        try:
-            offset = int(header["offset"])
-            size = int(header["size"])
-        except KeyError as e:
-            raise AsarFileHeaderError(f"Could not read file '{path}': {e}")
-        self.seek(offset)
-        return self.read(size, decode, encoding)
+        offset, size = self._file_range(path)
+        if decode and self._is_binary(path):
+            decode = False
+        if self._mm is None:
+            self.seek(offset)
+            if as_memoryview:
+                return memoryview(self.read(size, decode=False))
+            return self.read(size, decode, encoding)
+        start = self._content_offset + offset
+        if as_memoryview:
+            return memoryview(self._mm)[start : start + size]
+        data = self._mm[start : start + size]
+        if decode:
+            data = data.decode(encoding or self.encoding)
+        return data
+
+    def read_bytes(self, path):
+        """Reads the raw bytes of a file contained in the Asar archive.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file in the archive to read.
+
+        Returns
+        -------
+        data : bytes
+            The raw data of the file.
+
+        Examples
+        --------
+        >>> with AsarFile("file.asar") as asar
+        ...     data = asar.read_bytes("folder/image.png")
+        """
+        return self.read_file(path, decode=False)
 
     def extract_file(self, path, dst=""):
         """Extracts a file from the Asar archive and saves it in the given directory.
@@ -382,15 +769,241 @@ class AsarFile:
         >>> with AsarFile("file.asar") as asar
         ...     asar.extract_file("folder/file.txt", dst="asar_contents")
         """
-        data = self.read_file(path, decode=False)
-        if not os.path.exists(dst):
-            os.makedirs(dst)
+        offset, size = self._file_range(path)
+        if dst:
+            os.makedirs(dst, exist_ok=True)
         dst_path = os.path.join(dst, os.path.split(path)[1])
-        with open(dst_path, "wb") as fh:
-            fh.write(data)
+        if self._sendfile(dst_path, offset, size):
+            pass
+        elif self._mm is None and size > COPY_CHUNK_SIZE:
+            self._copy_file(dst_path, offset, size)
+        else:
+            self._write_file(dst_path, self.read_file(path, as_memoryview=True))
         return dst_path
 
-    def extract(self, root="", dst="asar_contents"):
+    def _copy_file(self, dst_path, offset, size):
+        # Copies the file contents in chunks, so large files are never held in
+        # memory at once. The chunks are read into a reused per-thread buffer
+        # instead of allocating new bytes objects. Only used if the archive is not
+        # memory-mapped.
+        self.seek(offset)
+        buf = _get_copy_buffer()
+        with open(dst_path, "wb", buffering=WRITE_BUFFER_SIZE) as fh:
+            remaining = size
+            while remaining:
+                n = self._fh.readinto(buf[: min(len(buf), remaining)])
+                if not n:
+                    break
+                self._pos += n
+                fh.write(buf[:n])
+                remaining -= n
+
+    def _sendfile(self, dst_path, offset, size):
+        # Copies the file contents in-kernel without reading them into Python.
+        # Returns False if ``os.sendfile`` is not available or not supported for
+        # the file descriptors.
+        if not _USE_SENDFILE:
+            return False
+        fd = os.open(dst_path, _WRITE_FLAGS, 0o666)
+        try:
+            src = self._fh.fileno()
+            pos = self._content_offset + offset
+            end = pos + size
+            while pos < end:
+                sent = os.sendfile(fd, src, pos, end - pos)
+                if not sent:
+                    break
+                pos += sent
+        except OSError:
+            return False
+        finally:
+            os.close(fd)
+        return True
+
+    @staticmethod
+    def _write_file(dst_path, data):
+        if len(data) > RAW_WRITE_SIZE:
+            with open(dst_path, "wb", buffering=WRITE_BUFFER_SIZE) as fh:
+                fh.write(data)
+            return
+        # Small files skip the buffered file object and are written directly
+        fd = os.open(dst_path, _WRITE_FLAGS, 0o666)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _make_dirs(dirs):
+        # Parents are created before their children (a parent path is always
+        # shorter), so directories whose parent was just created only need a
+        # single ``mkdir`` instead of the existence checks of ``os.makedirs``.
+        created = set()
+        for dst_dir in sorted(dirs, key=len):
+            if not dst_dir:
+                continue
+            if os.path.dirname(dst_dir) in created:
+                try:
+                    os.mkdir(dst_dir)
+                except FileExistsError:
+                    if not os.path.isdir(dst_dir):
+                        raise
+            else:
+                os.makedirs(dst_dir, exist_ok=True)
+            created.add(dst_dir)
+
+    def _madvise(self, advice, offset, size):
+        # Passes an access pattern hint for a range of the archive contents to the
+        # kernel. The hints are optional, so they are skipped if the archive is not
+        # memory-mapped or ``madvise`` is not supported on the platform.
+        if advice is None or not hasattr(self._mm, "madvise"):
+            return
+        start = self._content_offset + offset
+        # The start of the range has to be aligned to the page size
+        aligned = start - start % mmap.PAGESIZE
+        try:
+            self._mm.madvise(advice, aligned, size + start - aligned)
+        except (OSError, ValueError):
+            pass
+
+    def _extract_data(self, dst_path, offset, data):
+        # Writes a file for ``extract``. If the archive is memory-mapped, ``data``
+        # is only a view of the map and the file is copied in-kernel if possible.
+        # ``os.sendfile`` reads at an explicit offset, so it is safe to use from
+        # multiple threads.
+        if self._mm is None or not self._sendfile(dst_path, offset, len(data)):
+            self._write_file(dst_path, data)
+
+    def _extract_batch(self, batch):
+        # Writes a batch of ``(dst_path, offset, data)`` files for ``extract``.
+        # Submitting each file separately to the thread pool costs more than
+        # writing a small file.
+        for dst_path, offset, data in batch:
+            self._extract_data(dst_path, offset, data)
+
+    def _iter_contents(self, items):
+        # Asar archives store the file contents contiguously. Instead of seeking
+        # and reading each file separately, adjacent files of the ``items`` (sorted
+        # ``(offset, size, ...)`` tuples) are read in batches of up to
+        # ``BULK_READ_SIZE`` bytes and sliced in memory. Files larger than
+        # ``COPY_CHUNK_SIZE`` are not read and yielded with ``None`` as data.
+        # If the archive is memory-mapped, all files are yielded as views of the map.
+        if self._mm is not None:
+            view = memoryview(self._mm)
+            for item in items:
+                start = self._content_offset + item[0]
+                yield item, view[start : start + item[1]]
+            return
+        pos = 0
+        while pos < len(items):
+            start = items[pos][0]
+            end = start + items[pos][1]
+            if end - start > COPY_CHUNK_SIZE:
+                yield items[pos], None
+                pos += 1
+                continue
+            stop = pos + 1
+            while stop < len(items):
+                offset, size = items[stop][:2]
+                if offset > end or size > COPY_CHUNK_SIZE:
+                    break
+                if offset + size - start > BULK_READ_SIZE:
+                    break
+                end = max(end, offset + size)
+                stop += 1
+            self.seek(start)
+            data = memoryview(self.read(end - start, decode=False))
+            for item in items[pos:stop]:
+                offset = item[0] - start
+                yield item, data[offset : offset + item[1]]
+            pos = stop
+
+    def _write_contents(self, items, max_workers):
+        # Writes the files of the sorted ``(offset, size, dst_path)`` items for
+        # ``extract``. The files are read sequentially and written by a thread pool
+        # in batches. The number of pending bytes is limited, so at most a few
+        # batches of ``_iter_contents`` are kept in memory. Large files are
+        # prefetched when they are queued, so reading them overlaps with the
+        # writes of the previous files.
+        pending, pending_size = deque(), 0
+        batch, batch_size = list(), 0
+        with ThreadPoolExecutor(max_workers) as pool:
+            for (offset, size, dst_path), data in self._iter_contents(items):
+                if data is None:
+                    self._copy_file(dst_path, offset, size)
+                    continue
+                if size > PREFETCH_SIZE:
+                    self._madvise(_MADV_WILLNEED, offset, size)
+                batch.append((dst_path, offset, data))
+                batch_size += size
+                if len(batch) < EXTRACT_BATCH_FILES and batch_size < EXTRACT_BATCH_SIZE:
+                    continue
+                pending.append((pool.submit(self._extract_batch, batch), batch_size))
+                pending_size += batch_size
+                batch, batch_size = list(), 0
+                while pending_size > BULK_READ_SIZE:
+                    future, written = pending.popleft()
+                    future.result()
+                    pending_size -= written
+            if batch:
+                pending.append((pool.submit(self._extract_batch, batch), batch_size))
+            for future, _ in pending:
+                future.result()
+
+    def _index_tasks(self, root, dst):
+        # Collects the ``(offset, size, dst_path)`` of all files in the directory
+        # ``root`` from the file index, if it was built without parsing the header.
+        items, errors = list(), list()
+        prefix = self._index_key(root)
+        prefix = prefix + "/" if prefix else ""
+        dst_root = os.path.join(dst, root)
+        sep = os.path.sep
+        for path, (offset, size) in self._file_index.items():
+            if path.startswith(prefix):
+                dst_path = os.path.join(dst_root, path[len(prefix) :].replace("/", sep))
+                items.append((offset, size, dst_path))
+        for path, field in self._missing_fields.items():
+            if path.startswith(prefix):
+                errors.append(
+                    AsarFileHeaderError(f"Could not read file '{path}': '{field}'")
+                )
+        return items, errors
+
+    def _file_tasks(self, root, dst):
+        # Collects the ``(offset, size, dst_path)`` of all files in the directory
+        # ``root`` with a single traversal of the header, reading the offsets
+        # directly from the header items. Files which can't be extracted are
+        # returned as errors.
+        if self._root is None:
+            items, errors = self._index_tasks(root, dst)
+            # Empty or missing directories are resolved in the header
+            if items or errors or not root:
+                return items, errors
+        items, errors = list(), list()
+        path_join = os.path.join
+        stack = [(root, os.path.join(dst, root), self.get_header(root))]
+        while stack:
+            src_dir, dst_dir, files = stack.pop()
+            for name, item in files.items():
+                sub = item.get("files")
+                if sub is not None:
+                    src, dst_sub = path_join(src_dir, name), path_join(dst_dir, name)
+                    stack.append((src, dst_sub, sub))
+                    continue
+                try:
+                    offset, size = int(item["offset"]), int(item["size"])
+                except KeyError as e:
+                    path = path_join(src_dir, name)
+                    errors.append(
+                        AsarFileHeaderError(f"Could not read file '{path}': {e}")
+                    )
+                    continue
+                items.append((offset, size, path_join(dst_dir, name)))
+        return items, errors
+
+    def extract(self, root="", dst="asar_contents", max_workers=None):
         """Extracts a directory from the archive and saves it in the given directory.
 
         Parameters
@@ -401,6 +1014,9 @@ class AsarFile:
         dst : str, optional
             The path of the directory on the system in which the files are saved.
             If the directory does not exist it will be created.
+        max_workers : int, optional
+            The number of threads used for writing the extracted files. The default
+            is ``EXTRACT_WORKERS``.
 
         Returns
         -------
@@ -419,31 +1035,43 @@ class AsarFile:
         >>> with AsarFile("file.asar") as asar
         ...     asar.extract(dst="asar_contents")
         """
-        errors = list()
-        for _root, files in self.walk_files(root):
-            dst_dir = os.path.join(dst, _root)
-            for name in files:
-                try:
-                    self.extract_file(os.path.join(_root, name), dst=dst_dir)
-                except AsarFileHeaderError as e:
-                    errors.append(e)
+        items, errors = self._file_tasks(root, dst)
+        items.sort()
+        self._make_dirs({os.path.dirname(item[2]) for item in items})
+
+        # If the archive is memory-mapped, the kernel is told that the contents are
+        # read front to back. The hint is reset afterwards, since the map is shared
+        # with random access reads like ``read_file``.
+        if self._mm is not None:
+            self._madvise(_MADV_SEQUENTIAL, 0, len(self._mm) - self._content_offset)
+        try:
+            self._write_contents(items, max_workers or EXTRACT_WORKERS)
+        finally:
+            if self._mm is not None:
+                self._madvise(_MADV_NORMAL, 0, len(self._mm) - self._content_offset)
         return errors
 
     def __repr__(self):
         return f"{self.__class__.__name__}()"
 
-    def _treestr(self, lvl, name, item, indent, depth):
+    @staticmethod
+    def _treestr(name, item, indent, depth):
         vline = "│" + " " * max(indent - 1, 1)
         hline = "├" + "─" * max(indent - 2, 0) + " "
-        if lvl == 0:
-            s = f"{name}\n"
-        else:
-            s = vline * (lvl - 1) + f"{hline}{name}\n"
-        if depth is None or lvl < depth:
-            if "files" in item:
-                for key, val in item["files"].items():
-                    s += self._treestr(lvl + 1, key, val, indent, depth)
-        return s
+        # Line prefixes of each level, extended when a new level is reached
+        prefixes = [""]
+        lines = list()
+        stack = [(0, name, item)]
+        while stack:
+            lvl, name, item = stack.pop()
+            if lvl == len(prefixes):
+                prefixes.append(vline * (lvl - 1) + hline)
+            lines.append(f"{prefixes[lvl]}{name}\n")
+            if (depth is None or lvl < depth) and "files" in item:
+                # Children are pushed in reverse to pop them in the original order
+                children = [(lvl + 1, key, val) for key, val in item["files"].items()]
+                stack.extend(reversed(children))
+        return "".join(lines)
 
     def treestr(self, root="", indent=3, depth=None):
         """Returns a formatted string of the file structure in the Asar archive.
@@ -473,7 +1101,6 @@ class AsarFile:
         ├─ folder
         │  ├─ file.txt
         """
-        lvl = 0
         name = root or self.__class__.__name__
         item = self.get_header(root, keep_files=True)
-        return self._treestr(lvl, name, item, indent, depth)
+        return self._treestr(name, item, indent, depth)
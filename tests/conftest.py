@@ -0,0 +1,58 @@
+# coding: utf-8
+#
+# This code is part of asarlib.
+#
+# Copyright (c) 2022, Dylan Jones
+
+import json
+import struct
+import pytest
+
+
+def build_header(tree, content):
+    """Converts a tree of file contents to an Asar header, appending the contents.
+
+    The values of ``tree`` are either the ``bytes`` of a file, a tuple of the bytes
+    and additional fields of the header entry of the file, a nested ``dict`` for a
+    directory or a ``dict`` with a '_header' key for a raw header entry.
+    """
+    files = dict()
+    for name, value in tree.items():
+        if isinstance(value, tuple):
+            value, fields = value
+        else:
+            fields = dict()
+        if isinstance(value, bytes):
+            files[name] = {"size": len(value), "offset": str(len(content)), **fields}
+            content.extend(value)
+        elif "_header" in value:
+            files[name] = value["_header"]
+        else:
+            files[name] = {"files": build_header(value, content)["files"]}
+    return {"files": files}
+
+
+def write_archive(path, header, content=b""):
+    """Writes an Asar archive with the given header and contents."""
+    data = json.dumps(header).encode("utf-8")
+    # The header string is padded to a multiple of 4 bytes in the pickle format
+    payload = struct.pack("<I", len(data)) + data + b"\0" * (-len(data) % 4)
+    pickle = struct.pack("<I", len(payload)) + payload
+    with open(path, "wb") as fh:
+        fh.write(struct.pack("<II", 4, len(pickle)))
+        fh.write(pickle)
+        fh.write(content)
+
+
+@pytest.fixture
+def make_archive(tmp_path):
+    """Returns a function building an Asar archive from a tree of file contents."""
+
+    def _make_archive(tree, name="archive.asar"):
+        content = bytearray()
+        header = build_header(tree, content)
+        path = tmp_path / name
+        write_archive(path, header, bytes(content))
+        return str(path)
+
+    return _make_archive
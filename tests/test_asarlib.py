@@ -0,0 +1,191 @@
+# coding: utf-8
+#
+# This code is part of asarlib.
+#
+# Copyright (c) 2022, Dylan Jones
+
+import os
+import pytest
+from asarlib import AsarFile, AsarFileHeaderError, asarlib
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_reopen(make_archive, monkeypatch, lazy):
+    if not lazy:
+        # Without simdjson the header is parsed to a dict and indexed at once
+        monkeypatch.setattr(asarlib, "simdjson", None)
+    first = make_archive({"a.txt": b"old", "dir": {"x.txt": b"45"}}, "first.asar")
+    tree = {"b.txt": b"0123", "a.txt": b"new-a", "dir": {"y.txt": b"y"}}
+    second = make_archive(tree, "second.asar")
+
+    asar = AsarFile()
+    asar.open(first)
+    asar.get_header("dir")
+    assert asar.read_file("a.txt") == "old"
+    asar.open(second)
+    try:
+        assert asar.listdir("dir") == ["y.txt"]
+        assert asar.read_file("a.txt") == "new-a"
+        with pytest.raises(KeyError):
+            asar.read_file("dir/x.txt")
+    finally:
+        asar.close()
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_missing_path(make_archive, monkeypatch, lazy):
+    if not lazy:
+        monkeypatch.setattr(asarlib, "simdjson", None)
+    with AsarFile(make_archive({"dir": {"x.txt": b"x"}, "a.txt": b"a"})) as asar:
+        with pytest.raises(KeyError, match="'y.txt'"):
+            asar.read_file("dir/y.txt")
+        with pytest.raises(KeyError, match="'files'"):
+            asar.get_header("a.txt/b.txt")
+        with pytest.raises(AsarFileHeaderError, match="'dir': 'offset'"):
+            asar.read_file("dir")
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_read_binary(make_archive, monkeypatch, lazy):
+    if not lazy:
+        monkeypatch.setattr(asarlib, "simdjson", None)
+    tree = {
+        "img.png": bytes(range(256)),
+        "bin": {"run.sh": (b"#!/bin/sh", {"executable": True})},
+        "a.txt": b"some text",
+    }
+    with AsarFile(make_archive(tree)) as asar:
+        assert asar.read_file("img.png") == tree["img.png"]
+        assert asar.read_file("bin/run.sh") == b"#!/bin/sh"
+        assert asar.read_file("a.txt") == "some text"
+        for path in ["img.png", "bin/run.sh", "a.txt"]:
+            assert asar.read_bytes(path) == asar.read_file(path, decode=False)
+        assert isinstance(asar.read_bytes("a.txt"), bytes)
+
+
+def _integrity(data):
+    blocks = ["0" * 64 for _ in range(len(data) // 4 + 1)]
+    return {"algorithm": "SHA256", "hash": "0" * 64, "blockSize": 4, "blocks": blocks}
+
+
+INDEX_TREE = {
+    "a.txt": (b"some text", {"integrity": _integrity(b"some text")}),
+    "tool": (b"\x00ELF", {"executable": True, "integrity": _integrity(b"\x00ELF")}),
+    "empty.txt": b"",
+    "unpacked.node": {"_header": {"size": 12, "unpacked": True, "executable": True}},
+    "link": {"_header": {"link": "dir/sub/b.txt"}},
+    "empty": {},
+    "dir": {
+        "files": {"offset": b"a file called files"},
+        "sub": {"b.txt": b"nested", "run.sh": (b"#!/bin/sh", {"executable": True})},
+        "lib.so": {"_header": {"size": 3, "unpacked": True}},
+    },
+}
+
+
+def test_index_only(make_archive, monkeypatch):
+    pytest.importorskip("ijson")
+    path = make_archive(INDEX_TREE)
+    if asarlib.simdjson is not None:
+        # The lazily parsed header is used instead of the streamed index
+        with AsarFile(path, index_only=True) as asar:
+            assert asar._root is not None
+    # Without simdjson the header is parsed to a dict and indexed at once
+    monkeypatch.setattr(asarlib, "simdjson", None)
+    with AsarFile(path, index_only=True) as asar:
+        assert asar._root is None
+        index, executables = dict(asar._file_index), set(asar._executables)
+    with AsarFile(path) as asar:
+        assert index == asar._file_index
+        assert executables == asar._executables
+    assert sorted(index) == [
+        "a.txt",
+        "dir/files/offset",
+        "dir/sub/b.txt",
+        "dir/sub/run.sh",
+        "empty.txt",
+        "tool",
+    ]
+    assert executables == {"dir/sub/run.sh", "tool"}
+
+
+def _read_tree(root):
+    files = dict()
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            with open(path, "rb") as fh:
+                files[os.path.relpath(path, root)] = fh.read()
+    return files
+
+
+@pytest.mark.parametrize("root", ["", "dir", "dir/sub", "empty"])
+def test_extract_index_only(make_archive, tmp_path, monkeypatch, root):
+    pytest.importorskip("ijson")
+    monkeypatch.setattr(asarlib, "simdjson", None)
+    path = make_archive(INDEX_TREE)
+    with AsarFile(path) as asar:
+        errors = asar.extract(root, dst=str(tmp_path / "header"))
+    with AsarFile(path, index_only=True) as asar:
+        index_errors = asar.extract(root, dst=str(tmp_path / "index"))
+        # Only directories without any files are looked up in the header
+        assert (asar._root is None) is (root != "empty")
+    assert sorted(map(str, index_errors)) == sorted(map(str, errors))
+    assert _read_tree(tmp_path / "index") == _read_tree(tmp_path / "header")
+    with AsarFile(path, index_only=True) as asar:
+        with pytest.raises(KeyError):
+            asar.extract("missing", dst=str(tmp_path / "missing"))
+
+
+@pytest.mark.parametrize("bulk_size, chunk_size", [(64, 32), (100, 1000), (1, 1)])
+def test_extract_unmapped(make_archive, tmp_path, monkeypatch, bulk_size, chunk_size):
+    tree = {
+        "big.bin": bytes(range(256)) * 4,
+        "empty.txt": b"",
+        "dir": {f"f{i}.txt": f"file {i} ".encode() * i for i in range(20)},
+        "same.txt": {"_header": {"offset": "0", "size": 10}},
+        "last.txt": b"the last file",
+    }
+    path = make_archive(tree)
+    expected = {
+        "big.bin": tree["big.bin"],
+        "empty.txt": b"",
+        "same.txt": tree["big.bin"][:10],
+        "last.txt": tree["last.txt"],
+    }
+    for name, data in tree["dir"].items():
+        expected[os.path.join("dir", name)] = data
+
+    def no_mmap(*args, **kwargs):
+        raise OSError("mmap disabled")
+
+    monkeypatch.setattr(asarlib.mmap, "mmap", no_mmap)
+    monkeypatch.setattr(asarlib, "BULK_READ_SIZE", bulk_size)
+    monkeypatch.setattr(asarlib, "COPY_CHUNK_SIZE", chunk_size)
+    with AsarFile(path) as asar:
+        assert asar._mm is None
+        assert asar.extract(dst=str(tmp_path / "out")) == []
+        assert asar.extract("dir", dst=str(tmp_path / "sub")) == []
+    assert _read_tree(tmp_path / "out") == expected
+    sub = {k: v for k, v in expected.items() if k.startswith("dir")}
+    assert _read_tree(tmp_path / "sub") == sub
+
+
+def test_extract_resets_madvise(make_archive, tmp_path, monkeypatch):
+    if not hasattr(asarlib.mmap.mmap, "madvise"):
+        pytest.skip("madvise is not supported")
+    advices = list()
+
+    def madvise(self, advice, offset, size):
+        advices.append(advice)
+
+    def fail(self, batch):
+        raise OSError("write failed")
+
+    monkeypatch.setattr(AsarFile, "_madvise", madvise)
+    monkeypatch.setattr(AsarFile, "_extract_batch", fail)
+    with AsarFile(make_archive({"a.txt": b"data"})) as asar:
+        assert asar._mm is not None
+        with pytest.raises(OSError):
+            asar.extract(dst=str(tmp_path / "out"))
+    assert advices == [asarlib._MADV_SEQUENTIAL, asarlib._MADV_NORMAL]